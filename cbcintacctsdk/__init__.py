@@ -13,7 +13,8 @@ __all__ = [
     'NoPrivilegeError',
     'WrongParamsError',
     'NotFoundItemError',
-    'InternalServerError'
+    'InternalServerError',
+    'BatchPostError'
 ]
 
 name = "cbcintacctsdk"
@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Accounts(ApiBase):
     """Class for Accounts APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='GLACCOUNT')
@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class APPayments(ApiBase):
     """Class for AP Payments APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='APPYMT')
 
@@ -1,33 +1,165 @@
 """
 API Base class with util functions
 """
-import json
-import datetime
-import uuid
+import copy
+import itertools
+import secrets
 from warnings import warn
 from typing import Dict, List, Tuple
 from urllib.parse import unquote
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 
 import xmltodict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..exceptions import SageIntacctSDKError, ExpiredTokenError, InvalidTokenError, NoPrivilegeError, \
-    WrongParamsError, NotFoundItemError, InternalServerError, DataIntegrityWarning
+    WrongParamsError, NotFoundItemError, InternalServerError, BatchPostError, DataIntegrityWarning
 from .constants import dimensions_fields_mapping
 
+_SUPPORT_ID_RE = re.compile(r'Support ID: (.*?)\]')
+
+# Dimensions whose records are created through their legacy function (post_legacy_method) rather than <create>
+_LEGACY_POST_DIMENSIONS = ('CCTRANSACTION', 'EPPAYMENT', 'create_invoice', 'create_aradjustment', 'update_invoice',
+                           'update_customer')
+
+
+def _element_to_dict(element: ElementTree.Element):
+    """Convert an XML element to the value xmltodict.parse gives for it.
+
+    Parameters:
+        element (Element): Parsed XML element.
+
+    Returns:
+        Dict, or str / None for elements without attributes and children.
+    """
+    item = {'@' + key: value for key, value in element.attrib.items()}
+    for child in element:
+        value = _element_to_dict(child)
+        if child.tag not in item:
+            item[child.tag] = value
+        elif isinstance(item[child.tag], list):
+            item[child.tag].append(value)
+        else:
+            item[child.tag] = [item[child.tag], value]
+
+    text = ''.join(filter(None, [element.text] + [child.tail for child in element])).strip() or None
+    if not item:
+        return text
+    if text:
+        item['#text'] = text
+
+    return item
+
+
+def _build_adapter() -> HTTPAdapter:
+    """Build the HTTP adapter shared by all sessions.
+
+    Returns:
+        HTTPAdapter with connection pooling and retries on transient errors.
+    """
+    # Only retry when Sage Intacct cannot have processed the request: failed connections, throttling (429) and
+    # unavailable (503). Read errors and other 5xx may come after a write was applied, resending it would
+    # duplicate records.
+    retry_kwargs = {
+        'total': 5,
+        'read': 0,
+        'backoff_factor': 0.5,
+        'status_forcelist': [429, 503],
+        'respect_retry_after_header': True,
+        'raise_on_status': False
+    }
+    # Every Sage Intacct call is a POST, which urllib3 does not retry by default
+    try:
+        retry = Retry(allowed_methods=frozenset(['POST']), **retry_kwargs)
+    except TypeError:
+        # urllib3 < 1.26
+        retry = Retry(method_whitelist=frozenset(['POST']), **retry_kwargs)
+    return HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+
+
+_adapter = _build_adapter()
+_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    """Get the HTTP session of the current thread.
+
+    requests.Session is not documented as thread safe, so each thread (e.g. the get_all workers) gets its own
+    session. All of them mount the same adapter, whose urllib3 pool manager is thread safe, so keep-alive
+    connections are still pooled across threads.
+
+    Returns:
+        requests.Session.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['content-type'] = 'application/xml'
+        session.mount('https://', _adapter)
+        _local.session = session
+
+    return session
+
 
 class ApiBase:
     """The base class for all API classes."""
 
-    def __init__(self, dimension: str = None, pagesize: int = 2000, post_legacy_method: str = None):
+    __slots__ = ('_sender_id', '_sender_password', '_session_id', '_api_url', '_dimension', '_pagesize',
+                 '_post_legacy_method', '_cache_enabled', '_control_template', '_force_list',
+                 '_is_collection')
+
+    _timeout = (5, 60)
+    # Upper bound on pages fetched concurrently by get_all
+    _max_workers = 8
+    # Bytes read at a time from streamed get_all responses
+    _stream_chunk_size = 64 * 1024
+    # Sage Intacct accepts at most 30 functions in one request
+    _batch_size = 30
+    # Request controlids only need to be unique, a process wide counter is enough
+    _controlid_counter = itertools.count()
+    # Read query memoization shared by all instances, keyed by session and dimension: entries expire after
+    # _cache_ttl seconds, at most _cache_maxsize are kept
+    _cache = {}
+    _cache_lock = threading.Lock()
+    _cache_ttl = 60
+    _cache_maxsize = 512
+
+    def __init__(self, dimension: str = None, pagesize: int = 2000, post_legacy_method: str = None,
+                 cache_enabled: bool = True, is_collection: bool = True):
         self._sender_id = None
         self._sender_password = None
         self._session_id = None
         self._api_url = 'https://api.intacct.com/ia/xml/xmlgw.phtml'
         self._dimension = dimension
+        # False when dimension is an operation name rather than a record type returned in lists
+        self._is_collection = is_collection
+        self._force_list = frozenset((dimension,)) if dimension and is_collection else frozenset()
         self._pagesize = pagesize
         self._post_legacy_method = post_legacy_method
+        self._cache_enabled = cache_enabled
+        self._control_template = None
+        self._build_control_template()
+
+    def _build_control_template(self):
+        """
+        Build the static control block sent with every request.
+        controlid is kept as a placeholder so the element order required by the DTD is preserved.
+        :return: None
+        """
+        self._control_template = {
+            'senderid': self._sender_id,
+            'password': self._sender_password,
+            'controlid': None,
+            'uniqueid': False,
+            'dtdversion': 3.0,
+            'includewhitespace': False
+        }
 
     @property
     def dimension(self):
@@ -41,6 +173,7 @@ class ApiBase:
         :return: None
         """
         self._dimension = dimension
+        self._force_list = frozenset((dimension,)) if dimension and self._is_collection else frozenset()
 
     @property
     def post_legacy_method(self):
@@ -72,6 +205,7 @@ class ApiBase:
         :return: None
         """
         self._sender_id = sender_id
+        self._build_control_template()
 
     def set_sender_id(self, sender_id: str):
         """
@@ -80,6 +214,7 @@ class ApiBase:
         :return: None
         """
         self._sender_id = sender_id
+        self._build_control_template()
 
     def set_sender_password(self, sender_password: str):
         """
@@ -88,6 +223,7 @@ class ApiBase:
         :return: None
         """
         self._sender_password = sender_password
+        self._build_control_template()
 
     def get_session_id(self, user_id: str, company_id: str, user_password: str, entity_id: str = None):
         """
@@ -96,17 +232,10 @@ class ApiBase:
         :return: session id
         """
 
-        timestamp = datetime.datetime.now()
+        controlid = next(ApiBase._controlid_counter)
         dict_body = {
             'request': {
-                'control': {
-                    'senderid': self._sender_id,
-                    'password': self._sender_password,
-                    'controlid': timestamp,
-                    'uniqueid': False,
-                    'dtdversion': 3.0,
-                    'includewhitespace': False
-                },
+                'control': {**self._control_template, 'controlid': controlid},
                 'operation': {
                     'authentication': {
                         'login': {
@@ -118,7 +247,7 @@ class ApiBase:
                     },
                     'content': {
                         'function': {
-                            '@controlid': str(uuid.uuid4()),
+                            '@controlid': secrets.token_hex(8),
                             'getAPISession': None
                         }
                     }
@@ -147,6 +276,57 @@ class ApiBase:
         """
         self._session_id = session_id
 
+    def _cache_get(self, key: tuple):
+        """Look up a memoized read query result.
+
+        Parameters:
+            key (tuple): Cache key of the query.
+
+        Returns:
+            Tuple of (hit (bool), cached value).
+        """
+        if not self._cache_enabled:
+            return False, None
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return False, None
+
+        # Callers get their own copy so mutating a result cannot alter the cache
+        return True, copy.deepcopy(value)
+
+    def _cache_set(self, key: tuple, value):
+        """Memoize a read query result.
+
+        Parameters:
+            key (tuple): Cache key of the query.
+            value: Result to store.
+        """
+        if not self._cache_enabled:
+            return
+
+        value = copy.deepcopy(value)
+        with self._cache_lock:
+            if key not in self._cache and len(self._cache) >= self._cache_maxsize:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (time.monotonic() + self._cache_ttl, value)
+
+    def invalidate(self):
+        """Clear the memoized read query results of every API object.
+
+        Called once every write returns so following reads see the change. The whole cache is cleared because a write
+        through one object can change records read through another, e.g. create_invoice on Invoices and ARINVOICE
+        on ARInvoices.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+
     def _support_id_msg(self, errormessages):
         """Finds whether the error messages is list / dict and assign type and error assignment.
 
@@ -178,10 +358,10 @@ class ApiBase:
         support_id_msg = self._support_id_msg(errormessages)
         data_type = support_id_msg['type']
         error = support_id_msg['error']
-        if (error and error['description2']):
-            message = error['description2']
-            support_id = re.search('Support ID: (.*)]', message)
-            if support_id.group(1):
+        message = error.get('description2') if error else None
+        if message:
+            support_id = _SUPPORT_ID_RE.search(message)
+            if support_id and support_id.group(1):
                 decoded_support_id = unquote(support_id.group(1))
                 message = message.replace(support_id.group(1), decoded_support_id)
 
@@ -193,69 +373,143 @@ class ApiBase:
 
         return errormessages
 
-    def _post_request(self, dict_body: dict, api_url: str):
+    def _post_request(self, dict_body: dict, api_url: str, raise_on_failure: bool = True):
         """Create a HTTP post request.
 
         Parameters:
             data (dict): HTTP POST body data for the wanted API.
             api_url (str): Url for the wanted API.
+            raise_on_failure (bool): Raise when a function result failed, see _handle_response.
 
         Returns:
             A response from the request (dict).
         """
 
-        api_headers = {
-            'content-type': 'application/xml'
-        }
         body = xmltodict.unparse(dict_body)
 
-        response = requests.post(api_url, headers=api_headers, data=body)
+        response = _get_session().post(api_url, data=body, timeout=self._timeout)
 
-        parsed_xml = xmltodict.parse(response.text, force_list={self._dimension})
-        parsed_response = json.loads(json.dumps(parsed_xml))
+        if response.status_code != 200:
+            self._raise_for_status(response.status_code, response.text)
 
-        if response.status_code == 200:
-            if parsed_response['response']['control']['status'] == 'success':
-                api_response = parsed_response['response']['operation']
+        parsed_response = xmltodict.parse(response.text, force_list=self._force_list, dict_constructor=dict)
 
-            if parsed_response['response']['control']['status'] == 'failure':
-                exception_msg = self._decode_support_id(parsed_response['response']['errormessage'])
-                raise WrongParamsError('Some of the parameters are wrong', exception_msg)
+        return self._handle_response(parsed_response, raise_on_failure)
 
-            if api_response['authentication']['status'] == 'failure':
-                raise InvalidTokenError('Invalid token / Incorrect credentials', api_response['errormessage'])
+    def _post_request_streaming(self, body: str, api_url: str, rows: list):
+        """Create a HTTP post request and stream the returned records into rows.
 
-            if api_response['result']['status'] == 'success':
-                return api_response
+        The response body is parsed incrementally, so the records are never held as one
+        XML string or one response dict.
 
-            if api_response['result']['status'] == 'failure':
-                exception_msg = self._decode_support_id(api_response['result']['errormessage'])
+        Parameters:
+            body (str): HTTP POST body (xml) for the wanted API.
+            api_url (str): Url for the wanted API.
+            rows (list): List the records (response/operation/result/data/<record>) are appended to.
 
-                for error in exception_msg['error']:
-                    if error['description2'] and 'You do not have permission for API' in error['description2']:
-                        raise InvalidTokenError('The user has insufficient privilege', exception_msg)
+        Returns:
+            A response from the request without the records (dict).
+        """
+        with _get_session().post(api_url, data=body, timeout=self._timeout, stream=True) as response:
+            if response.status_code != 200:
+                self._raise_for_status(response.status_code, response.text)
+
+            # Read through iter_content so transport errors surface as requests exceptions
+            parser = ElementTree.XMLPullParser(events=('start', 'end'))
+            path = []
+            root = None
+            for chunk in itertools.chain(response.iter_content(chunk_size=self._stream_chunk_size), [None]):
+                if chunk is None:
+                    parser.close()
+                else:
+                    parser.feed(chunk)
+
+                for event, element in parser.read_events():
+                    if event == 'start':
+                        path.append(element)
+                        continue
+
+                    path.pop()
+                    if len(path) == 4 and path[-1].tag == 'data':
+                        rows.append(_element_to_dict(element))
+                        path[-1].remove(element)
+                    elif not path:
+                        root = element
+
+        parsed_response = {root.tag: _element_to_dict(root)}
+        return self._handle_response(parsed_response)
+
+    def _raise_for_status(self, status_code: int, response_text: str):
+        """Raise the exception matching a non 200 HTTP status.
+
+        The body is not parsed, the raw text is attached to the exception.
+
+        Parameters:
+            status_code (int): HTTP status code of the response.
+            response_text (str): Raw response body.
+        """
+        if status_code == 400:
+            raise WrongParamsError('Some of the parameters are wrong', response_text)
+
+        if status_code == 401:
+            raise InvalidTokenError('Invalid token / Incorrect credentials', response_text)
 
-                raise WrongParamsError('Error during {0}'.format(api_response['result']['function']), exception_msg)
+        if status_code == 403:
+            raise NoPrivilegeError('Forbidden, the user has insufficient privilege', response_text)
 
-        if response.status_code == 400:
-            raise WrongParamsError('Some of the parameters are wrong', parsed_response)
+        if status_code == 404:
+            raise NotFoundItemError('Not found item with ID', response_text)
 
-        if response.status_code == 401:
-            raise InvalidTokenError('Invalid token / Incorrect credentials', parsed_response)
+        if status_code == 498:
+            raise ExpiredTokenError('Expired token, try to refresh it', response_text)
 
-        if response.status_code == 403:
-            raise NoPrivilegeError('Forbidden, the user has insufficient privilege', parsed_response)
+        if status_code == 500:
+            raise InternalServerError('Internal server error', response_text)
 
-        if response.status_code == 404:
-            raise NotFoundItemError('Not found item with ID', parsed_response)
+        raise SageIntacctSDKError('Error: {0}'.format(response_text))
+
+    def _handle_response(self, parsed_response: dict, raise_on_failure: bool = True):
+        """Check a parsed response and raise the matching exception on errors.
+
+        Parameters:
+            parsed_response (dict): Parsed response body.
+            raise_on_failure (bool): Raise when a function result failed. When False the failed results are
+                returned with their decoded errormessage, as each function of a request is run on its own.
+
+        Returns:
+            The operation of the response (dict).
+        """
+        response = parsed_response['response']
+        control_status = response['control']['status']
+
+        if control_status == 'success':
+            api_response = response['operation']
+
+        if control_status == 'failure':
+            exception_msg = self._decode_support_id(response['errormessage'])
+            raise WrongParamsError('Some of the parameters are wrong', exception_msg)
+
+        if api_response['authentication']['status'] == 'failure':
+            raise InvalidTokenError('Invalid token / Incorrect credentials', api_response['errormessage'])
+
+        # Requests with several functions get one result per function
+        results = api_response['result']
+        for result in results if isinstance(results, list) else [results]:
+            if result['status'] == 'failure':
+                exception_msg = self._decode_support_id(result['errormessage'])
+                if not raise_on_failure:
+                    continue
+
+                for error in exception_msg['error']:
+                    if error['description2'] and 'You do not have permission for API' in error['description2']:
+                        raise InvalidTokenError('The user has insufficient privilege', exception_msg)
 
-        if response.status_code == 498:
-            raise ExpiredTokenError('Expired token, try to refresh it', parsed_response)
+                raise WrongParamsError('Error during {0}'.format(result['function']), exception_msg)
 
-        if response.status_code == 500:
-            raise InternalServerError('Internal server error', parsed_response)
+            if result['status'] != 'success':
+                raise SageIntacctSDKError('Error: {0}'.format(parsed_response))
 
-        raise SageIntacctSDKError('Error: {0}'.format(parsed_response))
+        return api_response
 
     def format_and_send_request(self, data: Dict):
         """Format data accordingly to convert them to xml.
@@ -266,39 +520,56 @@ class ApiBase:
         Returns:
             A response from the __post_request (dict).
         """
+        response = self._post_request(self._format_request(data), self._api_url)
+        return response['result']
+
+    def _format_request(self, data: Dict):
+        """Wrap data in the request envelope.
+
+        Parameters:
+            data (dict): HTTP POST body data for the wanted API.
+
+        Returns:
+            Request body (dict).
+        """
+        return self._format_batch_request([data])
+
+    def _format_batch_request(self, data_list: List[Dict]):
+        """Wrap several functions in one request envelope.
 
-        key = next(iter(data))
-        timestamp = datetime.datetime.now()
+        Parameters:
+            data_list (list): HTTP POST body data of each function.
+
+        Returns:
+            Request body (dict).
+        """
+        controlid = next(ApiBase._controlid_counter)
+        functions = []
+        for data in data_list:
+            key = next(iter(data))
+            functions.append({
+                '@controlid': secrets.token_hex(8),
+                key: data[key]
+            })
 
         dict_body = {
             'request': {
-                'control': {
-                    'senderid': self._sender_id,
-                    'password': self._sender_password,
-                    'controlid': timestamp,
-                    'uniqueid': False,
-                    'dtdversion': 3.0,
-                    'includewhitespace': False
-                },
+                'control': {**self._control_template, 'controlid': controlid},
                 'operation': {
                     'authentication': {
                         'sessionid': self._session_id
                     },
                     'content': {
-                        'function': {
-                            '@controlid': str(uuid.uuid4()),
-                            key: data[key]
-                        }
+                        'function': functions
                     }
                 }
             }
         }
 
-        response = self._post_request(dict_body, self._api_url)
-        return response['result']
+        return dict_body
 
     def post(self, data: Dict):
-        if self._dimension in ('CCTRANSACTION', 'EPPAYMENT', 'create_invoice', 'create_aradjustment','update_invoice','update_customer'):
+        if self._dimension in _LEGACY_POST_DIMENSIONS:
             return self._construct_post_legacy_payload(data)
 
         elif self._dimension == 'readReport':
@@ -313,6 +584,50 @@ class ApiBase:
         else:
             return self._construct_post_payload(data)
 
+    def post_many(self, data_list: List[Dict]):
+        """Create several records, sending up to 30 create functions per request.
+
+        Sage Intacct runs each function on its own, so a failed record does not stop the others.
+
+        Parameters:
+            data_list (list): Records to create.
+
+        Returns:
+            List of Dict, one result per record in the order of data_list. Check the 'status' of each result,
+            failed ones hold the decoded 'errormessage'.
+        """
+        legacy = self._dimension in _LEGACY_POST_DIMENSIONS
+        if not legacy and not (self._dimension and self._is_collection and self._post_legacy_method != 'delete'):
+            raise SageIntacctSDKError('post_many is not supported for {0}'.format(self._dimension))
+
+        results = []
+        try:
+            for start in range(0, len(data_list), self._batch_size):
+                chunk = data_list[start:start + self._batch_size]
+                if legacy:
+                    payloads = [{self._post_legacy_method: data} for data in chunk]
+                else:
+                    payloads = [{'create': {self._dimension: data}} for data in chunk]
+                dict_body = self._format_batch_request(payloads)
+                functions = dict_body['request']['operation']['content']['function']
+                controlids = [function['@controlid'] for function in functions]
+
+                try:
+                    response = self._post_request(dict_body, self._api_url, raise_on_failure=False)
+                except (SageIntacctSDKError, requests.RequestException) as e:
+                    response = {'results': results, 'failed_indexes': list(range(start, len(data_list)))}
+                    raise BatchPostError('Error during post_many after {0} of {1} records'.format(
+                        start, len(data_list)), response) from e
+
+                chunk_results = response['result'] if isinstance(response['result'], list) else [response['result']]
+                result_by_controlid = {result['controlid']: result for result in chunk_results}
+                results.extend(result_by_controlid[controlid] for controlid in controlids)
+        finally:
+            # Clear after the writes so a concurrent read cannot cache the state from before them
+            self.invalidate()
+
+        return results
+
     def _construct_post_payload(self, data: Dict):
         payload = {
             'create': {
@@ -320,7 +635,10 @@ class ApiBase:
             }
         }
 
-        return self.format_and_send_request(payload)
+        try:
+            return self.format_and_send_request(payload)
+        finally:
+            self.invalidate()
 
     def _construct_run_report(self, data: str):
         payload = {
@@ -341,21 +659,45 @@ class ApiBase:
 
     def _construct_delete(self, data: str) -> str:
         payload = {"delete": data}
-        return self.format_and_send_request(payload)
+        try:
+            return self.format_and_send_request(payload)
+        finally:
+            self.invalidate()
 
     def _construct_post_legacy_payload(self, data: Dict):
         payload = {
             self._post_legacy_method: data
         }
-        return self.format_and_send_request(payload)
+        try:
+            return self.format_and_send_request(payload)
+        finally:
+            self.invalidate()
 
     def _construct_post_legacy_aradjustment_payload(self, data: Dict):
         payload = {
             'create_aradjustment': data
         }
-        return self.format_and_send_request(payload)
+        try:
+            return self.format_and_send_request(payload)
+        finally:
+            self.invalidate()
+
+    def count(self, use_cache: bool = True):
+        """Count the records of the dimension.
+
+        Parameters:
+            use_cache (bool): Return a memoized count if there is one. Pagination passes False so records added
+                since the last count are fetched.
+
+        Returns:
+            Int.
+        """
+        key = (self._session_id, self._dimension, 'count')
+        if use_cache:
+            hit, count = self._cache_get(key)
+            if hit:
+                return count
 
-    def count(self):
         get_count = {
             'query': {
                 'object': self._dimension,
@@ -367,7 +709,9 @@ class ApiBase:
         }
 
         response = self.format_and_send_request(get_count)
-        return int(response['data']['@totalcount'])
+        count = int(response['data']['@totalcount'])
+        self._cache_set(key, count)
+        return count
 
     def read_by_query(self, fields: list = None):
         """Read by Query from Sage Intacct
@@ -399,6 +743,11 @@ class ApiBase:
         Returns:
             Dict.
         """
+        key = (self._session_id, self._dimension, 'get', field, value, tuple(fields or ()))
+        hit, response = self._cache_get(key)
+        if hit:
+            return response
+
         data = {
             'readByQuery': {
                 'object': self._dimension,
@@ -408,7 +757,9 @@ class ApiBase:
             }
         }
 
-        return self.format_and_send_request(data)['data']
+        response = self.format_and_send_request(data)['data']
+        self._cache_set(key, response)
+        return response
 
     def get_all(self, field: str = None, value: str = None, fields: list = None):
         """Get all data from Sage Intacct
@@ -416,31 +767,48 @@ class ApiBase:
         Returns:
             List of Dict.
         """
-        complete_data = []
-        count = self.count()
+        count = self.count(use_cache=False)
         pagesize = self._pagesize
-        for offset in range(0, count, pagesize):
-            data = {
-                'query': {
-                    'object': self._dimension,
-                    'select': {
-                        'field': fields if fields else dimensions_fields_mapping[self._dimension]
-                    },
-                    'pagesize': pagesize,
-                    'offset': offset
-                }
+        data = {
+            'query': {
+                'object': self._dimension,
+                'select': {
+                    'field': fields if fields else dimensions_fields_mapping[self._dimension]
+                },
+                'pagesize': pagesize,
+                'offset': '__OFFSET__'
             }
+        }
 
-            if field and value:
-                data['query']['filter'] = {
-                    'equalto': {
-                        'field': field,
-                        'value': value
-                    }
+        if field and value:
+            data['query']['filter'] = {
+                'equalto': {
+                    'field': field,
+                    'value': value
                 }
+            }
+
+        # Only the offset and the controlids change between pages, so render the XML once
+        dict_body = self._format_request(data)
+        dict_body['request']['control']['controlid'] = '__CONTROLID__'
+        dict_body['request']['operation']['content']['function'][0]['@controlid'] = '__FUNCTIONID__'
+        body_template = xmltodict.unparse(dict_body)
 
-            paginated_data = self.format_and_send_request(data)['data'][self._dimension]
-            complete_data.extend(paginated_data)
+        def get_page(offset: int):
+            body = body_template.replace('__OFFSET__', str(offset)) \
+                .replace('__CONTROLID__', str(next(ApiBase._controlid_counter))) \
+                .replace('__FUNCTIONID__', secrets.token_hex(8))
+
+            rows = []
+            self._post_request_streaming(body, self._api_url, rows)
+            return rows
+
+        # Pages are independent, so fetch them concurrently over the shared session
+        complete_data = []
+        offsets = range(0, count, pagesize)
+        with ThreadPoolExecutor(max_workers=max(1, min(self._max_workers, len(offsets)))) as executor:
+            for paginated_data in executor.map(get_page, offsets):
+                complete_data.extend(paginated_data)
 
         return complete_data
 
@@ -469,7 +837,7 @@ class ApiBase:
                 """
 
         complete_data = []
-        count = self.count()
+        count = self.count(use_cache=False)
         pagesize = self._pagesize
         offset = 0
         formatted_filter = filter_payload
@@ -7,6 +7,8 @@ from typing import Dict
 
 class ARAdjustment(ApiBase):
     """Class for AR Invoice APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='ARADJUSTMENT', post_legacy_method='ARADJUSTMENT')
 
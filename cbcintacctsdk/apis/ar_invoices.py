@@ -8,6 +8,7 @@ from typing import Dict
 
 class ARInvoices(ApiBase):
     """Class for AR Invoice APIs."""
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(dimension='ARINVOICE', post_legacy_method='create_invoice')
@@ -8,6 +8,7 @@ from .api_base import ApiBase
 
 class Attachments(ApiBase):
     """Class for Attachments APIs."""
+    __slots__ = ()
 
     def create_attachments_folder(self, data: Dict):
         """Post attachment folder to Sage Intacct.
@@ -18,7 +19,10 @@ class Attachments(ApiBase):
         data = {
             'create_supdocfolder': data
         }
-        return self.format_and_send_request(data)
+        try:
+            return self.format_and_send_request(data)
+        finally:
+            self.invalidate()
 
     def post(self, data: Dict):
         """Post attachments to Sage Intacct.
@@ -29,7 +33,10 @@ class Attachments(ApiBase):
         data = {
             'create_supdoc': data
         }
-        return self.format_and_send_request(data)
+        try:
+            return self.format_and_send_request(data)
+        finally:
+            self.invalidate()
 
     def get_folder(self, field: str, value: str):
         """Get attachment folder from Sage Intacct
@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class Bills(ApiBase):
     """Class for Bills APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='APBILL')
 
@@ -30,4 +32,7 @@ class Bills(ApiBase):
             }
         }
 
-        return self.format_and_send_request(data)
+        try:
+            return self.format_and_send_request(data)
+        finally:
+            self.invalidate()
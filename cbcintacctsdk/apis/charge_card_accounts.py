@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class ChargeCardAccounts(ApiBase):
     """Class for Charge Card Accounts APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='CREDITCARD')
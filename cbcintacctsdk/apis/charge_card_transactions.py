@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class ChargeCardTransactions(ApiBase):
     """Class for Charge Card Transactions APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='CCTRANSACTION', post_legacy_method='record_cctransaction')
 
@@ -28,4 +30,7 @@ class ChargeCardTransactions(ApiBase):
             }
         }
 
-        return self.format_and_send_request(data)
+        try:
+            return self.format_and_send_request(data)
+        finally:
+            self.invalidate()
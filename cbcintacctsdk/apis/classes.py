@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Classes(ApiBase):
     """Class for Sage Intacct Classes APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='CLASS')
@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Contacts(ApiBase):
     """Class for Contacts APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='CONTACT')
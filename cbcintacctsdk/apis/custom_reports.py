@@ -8,8 +8,10 @@ from .api_base import ApiBase
 
 class CustomReports(ApiBase):
     """Class for Expense Reports APIs."""
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(dimension='custom_reports') #post_legacy_method='create_invoice')
+        super().__init__(dimension='custom_reports', is_collection=False) #post_legacy_method='create_invoice')
 
     # def update_attachment(self, key: str, supdocid: str):
     #     """
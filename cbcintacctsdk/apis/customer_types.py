@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class CustomerTypes(ApiBase):
     """Class for Customers APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='CUSTTYPE')
 
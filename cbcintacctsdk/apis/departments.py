@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Departments(ApiBase):
     """Class for Departments APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='DEPARTMENT')
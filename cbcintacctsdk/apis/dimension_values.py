@@ -6,6 +6,8 @@ from typing import Dict
 from .api_base import ApiBase
 
 class DimensionValues(ApiBase):
+    __slots__ = ()
+
     def count(self, dimension_name: str):
         get_count = {
             'query': {
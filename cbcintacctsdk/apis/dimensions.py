@@ -11,6 +11,8 @@ class Dimensions(ApiBase):
     Returns:
         List of Dict of dimensions
     """
+    __slots__ = ()
+
     def get_all(self):
         data = {
             'getDimensions': {}
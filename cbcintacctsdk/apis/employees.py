@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Employees(ApiBase):
     """Class for Employees APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='EMPLOYEE')
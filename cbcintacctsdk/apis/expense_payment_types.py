@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class ExpensePaymentTypes(ApiBase):
     """Class for Expense Payment Types APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='EXPENSEPAYMENTTYPE')
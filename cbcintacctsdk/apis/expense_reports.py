@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class ExpenseReports(ApiBase):
     """Class for Expense Reports APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='EEXPENSES')
 
@@ -26,4 +28,7 @@ class ExpenseReports(ApiBase):
                 'supdocid': supdocid
             }
         }
-        return self.format_and_send_request(data)
+        try:
+            return self.format_and_send_request(data)
+        finally:
+            self.invalidate()
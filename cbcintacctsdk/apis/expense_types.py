@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class ExpenseTypes(ApiBase):
     """Class for Expense Types APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='EEACCOUNTLABEL')
@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class GLDetail(ApiBase):
     """Class for GL Detail APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='GLDETAIL')
@@ -7,5 +7,7 @@ from .api_base import ApiBase
 
 class Invoices(ApiBase):
     """Class for AR Invoice APIs."""
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(dimension='create_invoice', post_legacy_method='create_invoice')
+        super().__init__(dimension='create_invoice', post_legacy_method='create_invoice', is_collection=False)
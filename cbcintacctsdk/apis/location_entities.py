@@ -6,5 +6,7 @@ from .api_base import ApiBase
 
 class LocationEntities(ApiBase):
     """Class for Location Entities APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='LOCATIONENTITY')
@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Locations(ApiBase):
     """Class for Locations APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='LOCATION')
@@ -7,5 +7,7 @@ from .api_base import ApiBase
 
 class ReadReport(ApiBase):
     """Class for AR Invoice APIs."""
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(dimension='readReport')
+        super().__init__(dimension='readReport', is_collection=False)
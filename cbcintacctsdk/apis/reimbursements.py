@@ -8,6 +8,8 @@ from .api_base import ApiBase
 
 class Reimbursements(ApiBase):
     """Class for Reimbursements APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='EPPAYMENT', post_legacy_method='create_reimbursementrequest')
 
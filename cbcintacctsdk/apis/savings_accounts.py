@@ -6,6 +6,8 @@ from .api_base import ApiBase
 
 class SavingsAccounts(ApiBase):
     """Class for Savings Accounts APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='SAVINGSACCOUNT')
 
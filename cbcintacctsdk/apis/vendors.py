@@ -8,5 +8,7 @@ from .api_base import ApiBase
 
 class Vendors(ApiBase):
     """Class for Vendors APIs."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(dimension='VENDOR')
@@ -61,6 +61,14 @@ class InternalServerError(SageIntacctSDKError):
     """The rest SageIntacctSDK errors, 500 error."""
 
 
+class BatchPostError(SageIntacctSDKError):
+    """A post_many request failed as a whole.
+
+    response holds the results received before the failure ('results') and the indexes of the records without a
+    result ('failed_indexes'). Records of the failed request may or may not have been created.
+    """
+
+
 # WARNING SECTION
 class DataIntegrityWarning(SageIntacctSDKWarning):
     """Warns the user that a query did not return all records meeting specified criteria"""
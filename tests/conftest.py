@@ -0,0 +1,16 @@
+"""
+Test fixtures
+"""
+import pytest
+
+from cbcintacctsdk.apis import api_base
+
+from .fakes import FakeIntacct
+
+
+@pytest.fixture
+def intacct(monkeypatch):
+    fake = FakeIntacct()
+    monkeypatch.setattr(api_base, '_get_session', lambda: fake)
+    monkeypatch.setattr(api_base.ApiBase, '_cache', {})
+    return fake
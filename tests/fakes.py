@@ -0,0 +1,88 @@
+"""
+Fake Sage Intacct XML gateway used by the tests
+"""
+import io
+
+import xmltodict
+
+RESPONSE = '<?xml version="1.0" encoding="UTF-8"?><response><control><status>success</status>' \
+           '<senderid>sender</senderid><controlid>1</controlid><uniqueid>false</uniqueid>' \
+           '<dtdversion>3.0</dtdversion></control><operation><authentication><status>success</status>' \
+           '<userid>user</userid><companyid>company</companyid></authentication>{0}</operation></response>'
+
+RESULT = '<result><status>success</status><function>{0}</function><controlid>{1}</controlid>{2}</result>'
+
+FAILURE = '<result><status>failure</status><function>{0}</function><controlid>{1}</controlid><errormessage>' \
+          '<error><errorno>BL01001973</errorno><description></description>' \
+          '<description2>Could not create record [Support ID: abc%7E123]</description2>' \
+          '<correction></correction></error></errormessage></result>'
+
+# Sage Intacct often leaves description2 empty
+FAILURE_EMPTY_DESCRIPTION = '<result><status>failure</status><function>{0}</function><controlid>{1}</controlid>' \
+                            '<errormessage><error><errorno>BL01001973</errorno>' \
+                            '<description>Record failed</description>' \
+                            '<description2></description2><correction></correction></error></errormessage></result>'
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, text: str, status_code: int = 200):
+        self.text = text
+        self.status_code = status_code
+        self.raw = io.BytesIO(text.encode('utf-8'))
+
+    def iter_content(self, chunk_size: int = 1):
+        return iter(lambda: self.raw.read(chunk_size), b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.raw.close()
+
+
+class FakeIntacct:
+    """Fake session answering query, readByQuery and create functions from in-memory records.
+
+    Records created with a truthy 'FAIL' field get a failure result, without description2 when 'FAIL' is 'empty'.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.requests = []
+        self.response = None
+
+    def post(self, url, data=None, timeout=None, stream=False):
+        request = xmltodict.parse(data, force_list={'function'})['request']
+        self.requests.append(request)
+        if self.response:
+            return FakeResponse(*self.response)
+
+        results = ''.join(self._result(function) for function in request['operation']['content']['function'])
+        return FakeResponse(RESPONSE.format(results))
+
+    def _result(self, function: dict):
+        controlid = function['@controlid']
+        name = next(key for key in function if key != '@controlid')
+        body = function[name]
+
+        if name in ('query', 'readByQuery'):
+            records = self.records.get(body['object'], [])
+            offset = int(body.get('offset') or 0)
+            page = records[offset:offset + int(body['pagesize'])]
+            rows = ''.join(xmltodict.unparse({body['object']: record}, full_document=False) for record in page)
+            data = '<data listtype="{0}" count="{1}" totalcount="{2}" numremaining="{3}">{4}</data>'.format(
+                body['object'], len(page), len(records), len(records) - offset - len(page), rows)
+            return RESULT.format(name, controlid, data)
+
+        # <create><OBJECT>...</OBJECT></create> or a legacy function such as <create_invoice>...</create_invoice>
+        dimension, record = next(iter(body.items())) if name == 'create' else (name, body)
+        if record.get('FAIL'):
+            return (FAILURE_EMPTY_DESCRIPTION if record['FAIL'] == 'empty' else FAILURE).format(name, controlid)
+
+        records = self.records.setdefault(dimension, [])
+        records.append(record)
+        data = '<data listtype="objects" count="1"><{0}><RECORDNO>{1}</RECORDNO></{0}></data>'.format(
+            dimension, len(records))
+        return RESULT.format(name, controlid, data)
@@ -0,0 +1,255 @@
+"""
+Tests for the API base class
+"""
+import socket
+import threading
+from xml.etree import ElementTree
+
+import pytest
+import requests
+import xmltodict
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError, ReadTimeoutError
+
+from cbcintacctsdk import BatchPostError, InternalServerError, SageIntacctSDKError, WrongParamsError
+from cbcintacctsdk.apis import api_base, Accounts, ApiBase, ARInvoices, Attachments, Contacts, Customers, Invoices, \
+    ReadReport
+
+from .fakes import FAILURE, RESPONSE, RESULT, FakeResponse
+
+
+def test_get_session_is_per_thread_over_shared_adapter():
+    sessions = []
+
+    def get_session():
+        sessions.append(api_base._get_session())
+
+    threads = [threading.Thread(target=get_session) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 4
+    assert all(session.get_adapter('https://api.intacct.com') is api_base._adapter for session in sessions)
+    assert api_base._get_session() is api_base._get_session()
+
+
+def test_adapter_retries_post_only_before_processing():
+    retry = api_base._adapter.max_retries
+
+    assert retry.is_retry('POST', 429)
+    assert retry.is_retry('POST', 503)
+    assert not retry.is_retry('POST', 500)
+    assert not retry.is_retry('POST', 502)
+    assert not retry.is_retry('POST', 504)
+
+    assert retry.increment(method='POST', error=NewConnectionError(None, 'refused'))
+    for error in (ReadTimeoutError(None, '/', 'timed out'), ProtocolError('connection reset')):
+        with pytest.raises((MaxRetryError, ReadTimeoutError, ProtocolError)):
+            retry.increment(method='POST', error=error)
+
+
+def test_pagination_does_not_use_memoized_count(intacct):
+    intacct.records['GLACCOUNT'] = [{'RECORDNO': str(i)} for i in range(3)]
+    accounts = Accounts()
+    accounts._pagesize = 2
+
+    assert accounts.count() == 3
+    assert len(accounts.get_all()) == 3
+
+    intacct.records['GLACCOUNT'] += [{'RECORDNO': str(i)} for i in range(3, 10)]
+
+    assert accounts.count() == 3
+    assert [record['RECORDNO'] for record in accounts.get_all()] == [str(i) for i in range(10)]
+    assert len(accounts.get_by_query(and_filter=[('equalto', 'STATUS', 'active')])) == 10
+
+
+def test_get_returns_a_copy_of_the_memoized_result(intacct):
+    intacct.records['CUSTOMER'] = [{'CUSTOMERID': 'C1'}]
+    customers = Customers()
+
+    customers.get('CUSTOMERID', 'C1')['CUSTOMER'].clear()
+
+    assert customers.get('CUSTOMERID', 'C1')['CUSTOMER'] == [{'CUSTOMERID': 'C1'}]
+    assert len(intacct.requests) == 1
+
+
+def test_writes_clear_the_cache_of_every_api_object(intacct):
+    ar_invoices = ARInvoices()
+    ar_invoices.get('RECORDNO', '1')
+    ar_invoices.get('RECORDNO', '1')
+    assert len(intacct.requests) == 1
+
+    Invoices().post({'customerid': 'C1'})
+    ar_invoices.get('RECORDNO', '1')
+    assert len(intacct.requests) == 3
+
+    Attachments().post({'supdocid': 'A1'})
+    ar_invoices.get('RECORDNO', '1')
+    assert len(intacct.requests) == 5
+
+
+def test_reads_during_a_write_are_not_kept(intacct):
+    ar_invoices = ARInvoices()
+    post = intacct.post
+
+    def post_with_concurrent_read(url, data=None, **kwargs):
+        if '<create>' in data:
+            # Another thread reads while the write is in flight
+            ar_invoices.get('RECORDNO', '1')
+        return post(url, data=data, **kwargs)
+
+    intacct.post = post_with_concurrent_read
+    Contacts().post({'CONTACTNAME': 'C1'})
+    ar_invoices.get('RECORDNO', '1')
+
+    assert len(intacct.requests) == 3
+
+
+def test_cache_can_be_disabled(intacct):
+    accounts = ApiBase(dimension='GLACCOUNT', cache_enabled=False)
+
+    accounts.count()
+    accounts.count()
+
+    assert len(intacct.requests) == 2
+
+
+def test_post_many_returns_a_result_per_record(intacct):
+    records = [{'CONTACTNAME': 'C{0}'.format(i)} for i in range(65)]
+    records[3]['FAIL'] = 'true'
+    records[40]['FAIL'] = 'empty'
+
+    results = Contacts().post_many(records)
+
+    assert len(intacct.requests) == 3
+    assert [result['status'] for result in results] == ['failure' if i in (3, 40) else 'success' for i in range(65)]
+    assert results[3]['errormessage']['error'][0]['description2'] == 'Could not create record [Support ID: abc~123]'
+    assert results[40]['errormessage']['error'][0]['description2'] is None
+    assert results[40]['errormessage']['error'][0]['description'] == 'Record failed'
+    assert len(intacct.records['CONTACT']) == 63
+
+
+def test_post_many_uses_the_legacy_function(intacct):
+    Invoices().post_many([{'customerid': 'C1'}, {'customerid': 'C2'}])
+
+    functions = intacct.requests[0]['operation']['content']['function']
+    assert [list(function)[1] for function in functions] == ['create_invoice', 'create_invoice']
+
+
+def test_post_many_rejects_non_record_dimensions(intacct):
+    with pytest.raises(SageIntacctSDKError):
+        ReadReport().post_many([{'reportName': 'R1'}])
+
+    assert not intacct.requests
+
+
+def test_post_many_error_keeps_the_results_received(intacct, monkeypatch):
+    post = intacct.post
+
+    def fail_second_request(*args, **kwargs):
+        if len(intacct.requests) == 1:
+            intacct.requests.append(None)
+            return FakeResponse('<error/>', 502)
+        return post(*args, **kwargs)
+
+    monkeypatch.setattr(intacct, 'post', fail_second_request)
+
+    with pytest.raises(BatchPostError) as error:
+        Contacts().post_many([{'CONTACTNAME': 'C{0}'.format(i)} for i in range(65)])
+
+    assert len(error.value.response['results']) == 30
+    assert error.value.response['failed_indexes'] == list(range(30, 65))
+
+
+@pytest.mark.parametrize('xml', [
+    '<response><data count="2"><X a="1" b="2"><A>1</A></X><X a="3">text</X></data></response>',
+    '<response><X><A/><B></B><C>  </C><D>value</D></X></response>',
+    '<response><X><A>1</A><A>2</A><A>3</A><B><C>1</C><C>2</C></B></X></response>',
+    '<response><X>before<A>1</A>after</X></response>',
+    '<response><data listtype="X" count="1"><X><RECORDNO>1</RECORDNO></X></data></response>',
+])
+def test_element_to_dict_matches_xmltodict(xml):
+    element = ElementTree.fromstring(xml)
+
+    assert {element.tag: api_base._element_to_dict(element)} == xmltodict.parse(xml, dict_constructor=dict)
+
+
+def test_get_all_single_record_page_is_a_list(intacct):
+    intacct.records['GLACCOUNT'] = [{'RECORDNO': '1', 'TITLE': 'Cash'}]
+
+    assert Accounts().get_all() == [{'RECORDNO': '1', 'TITLE': 'Cash'}]
+
+
+def test_streamed_failure_result_raises(intacct):
+    intacct.response = (RESPONSE.format(FAILURE.format('query', 'page')), 200)
+    rows = []
+
+    with pytest.raises(WrongParamsError) as error:
+        Accounts()._post_request_streaming('<request/>', 'https://api.intacct.com', rows)
+
+    assert error.value.response['error'][0]['description2'] == 'Could not create record [Support ID: abc~123]'
+    assert rows == []
+
+
+@pytest.mark.parametrize('status_code, exception', [(500, InternalServerError), (502, SageIntacctSDKError)])
+def test_streamed_error_status_raises_with_raw_text(intacct, status_code, exception):
+    intacct.response = ('<html>gateway error</html>', status_code)
+
+    with pytest.raises(exception) as error:
+        Accounts()._post_request_streaming('<request/>', 'https://api.intacct.com', [])
+
+    # Unmapped statuses put the raw text in the message, as before
+    assert '<html>gateway error</html>' in (error.value.response or error.value.message)
+
+
+def test_streamed_truncated_body_raises_requests_error():
+    # A real socket, so the error comes out of requests' own body handling
+    body = RESPONSE.format(RESULT.format('query', 'page', '<data count="1"><GLACCOUNT><RECORDNO>1')).encode('utf-8')
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def serve():
+        connection, _ = server.accept()
+        with connection:
+            connection.recv(65536)
+            connection.sendall(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % (len(body) + 100) + body)
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    url = 'http://127.0.0.1:{0}/'.format(server.getsockname()[1])
+
+    with pytest.raises(requests.RequestException):
+        Accounts()._post_request_streaming('<request/>', url, [])
+
+    thread.join()
+    server.close()
+
+
+def test_get_all_fills_the_rendered_query_template(intacct):
+    intacct.records['GLACCOUNT'] = [{'RECORDNO': str(i)} for i in range(5)]
+    accounts = Accounts()
+    accounts._pagesize = 2
+
+    accounts.get_all(field='STATUS', value='active')
+
+    pages = intacct.requests[1:]
+    queries = [request['operation']['content']['function'][0]['query'] for request in pages]
+    assert sorted(query['offset'] for query in queries) == ['0', '2', '4']
+    assert all(query['filter'] == {'equalto': {'field': 'STATUS', 'value': 'active'}} for query in queries)
+    assert len({request['control']['controlid'] for request in pages}) == 3
+    assert len({request['operation']['content']['function'][0]['@controlid'] for request in pages}) == 3
+    assert not any('__' in value for request in pages for value in (
+        request['control']['controlid'], request['operation']['content']['function'][0]['@controlid']))
+
+
+def test_xmltodict_backend_accepts_the_arguments_used():
+    # Runs against whichever xmltodict is installed, including the xmltodict-fast replacement from the fast extra
+    body = api_base.xmltodict.unparse(ApiBase(dimension='GLACCOUNT')._format_request({'get': {'@object': 'X'}}))
+    data = '<data><GLACCOUNT><RECORDNO>1</RECORDNO></GLACCOUNT></data>'
+    xml = RESPONSE.format(RESULT.format('readByQuery', '1', data))
+
+    parsed = api_base.xmltodict.parse(xml, force_list=frozenset(('GLACCOUNT',)), dict_constructor=dict)
+
+    assert '<function controlid=' in body
+    assert type(parsed) is dict
+    assert parsed['response']['operation']['result']['data']['GLACCOUNT'] == [{'RECORDNO': '1'}]